@@ -2,7 +2,7 @@
 # ========================================================================
 # This is the main, user-facing entry point for the entire project.
 # It provides a simple command-line interface to choose which part of
-# the pipeline to run: Data, Training, or Prediction.
+# the pipeline to run: Data, Training, Prediction, Streaming, or Monitoring.
 #
 # To use, simply run this file from your terminal:
 # >> python main.py
@@ -34,7 +34,9 @@ def main_menu():
         "1": ("Run the full Data Pipeline (Collector & Processor)", "main_data_pipeline.py"),
         "2": ("Train the Model", "main_train.py"),
         "3": ("Run a Prediction Demo", "main_predict.py"),
-        "4": ("Exit", None)
+        "4": ("Run the Streaming Scorer on live observations", "main_stream.py"),
+        "5": ("Run Drift Monitoring", "main_monitor.py"),
+        "6": ("Exit", None)
     }
 
     while True:
@@ -45,10 +47,10 @@ def main_menu():
         for key, (description, _) in menu.items():
             print(f"  {key}) {description}")
 
-        choice = input("\nEnter your choice (1-4): ")
+        choice = input("\nEnter your choice (1-6): ")
 
         if choice in menu:
-            if choice == "4":
+            if choice == "6":
                 print("Exiting program. Goodbye!")
                 break
 
@@ -57,7 +59,7 @@ def main_menu():
 
             input("Press Enter to return to the menu...")
         else:
-            print("\n*** Invalid choice. Please enter a number between 1 and 4. ***\n")
+            print("\n*** Invalid choice. Please enter a number between 1 and 6. ***\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+# main_monitor.py
+# ===============
+# This is the main entry point for drift monitoring.
+# It builds the reference window from the processed dataset on first run,
+# then reports how far the data scored over the last few days (recorded by
+# the predictor and the streaming scorer) has drifted from it.
+# ======================================================================
+
+import pandas as pd
+from src.utils.logger import logger
+from src.monitoring import drift
+from src.prediction import predictor
+from src.config import REFERENCE_WINDOW_PATH, MONITORING_WINDOW_DAYS
+
+
+def run_monitoring():
+    """
+    Builds the monitoring reference window if needed and prints the drift
+    report for the last few days of scored data.
+    """
+    logger.info("========== STARTING: DRIFT MONITORING ==========")
+    print("MAIN_MONITOR: Checking for data drift. Check 'logs/app.log' for details.")
+
+    model = predictor.get_model()
+    if not REFERENCE_WINDOW_PATH.exists():
+        if drift.build_reference_window(model) is None:
+            return
+        print("MAIN_MONITOR: Built the reference window. Scored data is recorded from now on.")
+
+    report = drift.check_drift(model.version if model is not None else None)
+    if report is None:
+        print(f"MAIN_MONITOR: No scored data recorded in the last {MONITORING_WINDOW_DAYS} days.")
+        return
+
+    with pd.option_context('display.float_format', '{:.4f}'.format):
+        print("\n--- DRIFT REPORT ---")
+        print(report)
+    logger.info(f"Drift report:\n{report}")
+
+    logger.success("========== COMPLETED: DRIFT MONITORING ==========")
+    print("MAIN_MONITOR: Drift monitoring finished.")
+
+
+if __name__ == "__main__":
+    run_monitoring()
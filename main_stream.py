@@ -0,0 +1,35 @@
+# main_stream.py
+# ==============
+# This is the main entry point for real-time streaming scoring.
+# It restores the per-location rolling state, scores each new hourly
+# observation from the live feed as it arrives, and raises alerts when
+# the flood probability crosses the prediction threshold.
+# ======================================================================
+
+from src.utils.logger import logger
+from src.prediction import streamer
+from src.config import STREAM_SOURCE_PATH
+
+
+def run_streaming():
+    """
+    Scores observations from the live observation file, resuming from the
+    last saved state snapshot.
+    """
+    logger.info("========== STARTING: STREAMING SCORER ==========")
+    print("MAIN_STREAM: Scoring live observations. Check 'logs/app.log' for details.")
+
+    if not STREAM_SOURCE_PATH.exists():
+        logger.error(f"No observation feed found at '{STREAM_SOURCE_PATH}'.")
+        return
+
+    scorer = streamer.StreamScorer()
+    scorer.restore()
+    scorer.run(streamer.file_source(STREAM_SOURCE_PATH))
+
+    logger.success("========== COMPLETED: STREAMING SCORER ==========")
+    print("MAIN_STREAM: Streaming scorer finished.")
+
+
+if __name__ == "__main__":
+    run_streaming()
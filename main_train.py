@@ -14,9 +14,10 @@ def run_training():
     """
     logger.info("========== STARTING: STEP 2 - MODEL TRAINING ==========")
     print("MAIN_TRAIN: Executing model training pipeline. Check 'logs/app.log' for details.")
-    trainer.train_model()
+    version = trainer.train_model()
     logger.success("========== COMPLETED: STEP 2 - MODEL TRAINING ==========")
-    print("MAIN_TRAIN: Successfully trained and saved the model.")
+    print(f"MAIN_TRAIN: Successfully trained and saved model version '{version}'.")
+    print("MAIN_TRAIN: The evaluation report is being written in the background to 'models/reports/'.")
 
 
 if __name__ == "__main__":
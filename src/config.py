@@ -13,6 +13,8 @@ LOG_DIR = ROOT_DIR / "logs"
 RAW_API_DIR = DATA_DIR / "raw_api"
 GROUND_TRUTH_DIR = DATA_DIR / "ground_truth"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
+STREAM_DIR = DATA_DIR / "stream"
+MONITORING_DIR = DATA_DIR / "monitoring"
 MODEL_DIR = ROOT_DIR / "models"
 
 # --- File Paths ---
@@ -46,10 +48,59 @@ FEATURE_LIST = [
     'high_alt_temp_proxy'                  # Glacial melt proxy feature
 ]
 TARGET_VARIABLE = 'flood_event'
+# Rolling window lengths (in hourly observations) for the rainfall averages.
+# Shared by the batch processor and the streaming scorer so both agree.
+RAINFALL_SHORT_WINDOW_HRS = 24
+RAINFALL_LONG_WINDOW_HRS = 72
 
 # --- Model Artifacts ---
+# Legacy single-file model, still loaded if the registry is empty.
 MODEL_PATH = MODEL_DIR / "flood_prediction_xgboost_model.joblib"
-FEATURE_IMPORTANCE_PATH = MODEL_DIR / "feature_importance.png"
+# Versioned model registry (native XGBoost boosters plus metadata).
+MODEL_REGISTRY_DIR = MODEL_DIR / "registry"
+# Evaluation reports, one sub-directory per model version.
+REPORTS_DIR = MODEL_DIR / "reports"
+# Rows sampled from the test set for per-feature SHAP attributions.
+REPORT_ATTRIBUTION_SAMPLE_SIZE = 2000
+# Number of probability bins in the calibration curve.
+REPORT_CALIBRATION_BINS = 10
 
 # --- Prediction ---
 PREDICTION_THRESHOLD = 0.5
+# Pin a registry version (e.g. "v0003") instead of following the promoted one.
+PINNED_MODEL_VERSION = None
+# How often (in seconds) a running service checks for a newly promoted model.
+MODEL_REFRESH_SECONDS = 30
+
+# --- Streaming ---
+# Newline-delimited JSON observations consumed by the streaming scorer.
+STREAM_SOURCE_PATH = STREAM_DIR / "live_observations.jsonl"
+# Snapshot of the per-location rolling state, so a restart can resume.
+STREAM_STATE_PATH = STREAM_DIR / "stream_state.json"
+# Number of scored observations between state snapshots.
+STREAM_SNAPSHOT_EVERY = 100
+
+# --- Monitoring ---
+# Persisted sketch windows used for drift detection.
+REFERENCE_WINDOW_PATH = MONITORING_DIR / "reference_window.json"
+# Scored data is recorded into daily window files in this directory, one file
+# per writing process per day; readers merge them.
+MONITORING_PERIODS_DIR = MONITORING_DIR / "daily"
+# Recorded data is buffered in memory and flushed to disk after this many
+# rows or seconds, whichever comes first (and at process exit).
+MONITORING_FLUSH_ROWS = 10_000
+MONITORING_FLUSH_SECONDS = 60
+# Number of most recent daily windows merged into the "latest" window.
+# Older daily files are deleted.
+MONITORING_WINDOW_DAYS = 7
+# Name used for the model's predicted probabilities in monitoring windows.
+PREDICTION_COLUMN = 'predicted_probability'
+# Number of fixed histogram bins per feature (edges come from the reference window).
+MONITORING_BINS = 10
+# Accuracy parameter of the quantile sketch; larger is more accurate but bigger.
+QUANTILE_SKETCH_K = 200
+# Rows read per chunk when building a reference window from the processed dataset.
+MONITORING_CHUNK_SIZE = 100_000
+# Population Stability Index levels for flagging drift.
+PSI_WARNING_THRESHOLD = 0.1
+PSI_ALERT_THRESHOLD = 0.25
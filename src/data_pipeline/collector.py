@@ -17,6 +17,8 @@ def setup_directories():
     config.GROUND_TRUTH_DIR.mkdir(parents=True, exist_ok=True)
     config.PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
     config.MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    config.STREAM_DIR.mkdir(parents=True, exist_ok=True)
+    config.MONITORING_DIR.mkdir(parents=True, exist_ok=True)
     logger.info(f"Directory check complete. Raw data will be saved in '{config.RAW_API_DIR}'.")
 
 
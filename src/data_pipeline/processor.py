@@ -38,9 +38,9 @@ def process_and_feature_engineer():
 
     logger.info("Engineering time-series features (this may take a while)...")
     merged_df['rainfall_24hr_avg'] = merged_df.groupby(['lat', 'lon'])['rainfall_mm_per_hr'].transform(
-        lambda x: x.rolling(window=24, min_periods=1).mean())
+        lambda x: x.rolling(window=config.RAINFALL_SHORT_WINDOW_HRS, min_periods=1).mean())
     merged_df['rainfall_72hr_avg'] = merged_df.groupby(['lat', 'lon'])['rainfall_mm_per_hr'].transform(
-        lambda x: x.rolling(window=72, min_periods=1).mean())
+        lambda x: x.rolling(window=config.RAINFALL_LONG_WINDOW_HRS, min_periods=1).mean())
     merged_df['month'] = merged_df['timestamp'].dt.month
     merged_df['day_of_year'] = merged_df['timestamp'].dt.dayofyear
     merged_df['hour'] = merged_df['timestamp'].dt.hour
@@ -0,0 +1,3 @@
+# src/monitoring/__init__.py
+# This file makes the 'monitoring' directory a Python package.
+print("Initializing 'src.monitoring' package.")
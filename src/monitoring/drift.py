@@ -0,0 +1,334 @@
+# src/monitoring/drift.py
+# Contains functions for monitoring data drift and prediction drift.
+# A reference window of sketches is built once from the processed dataset.
+# Each process folds scored batches into an in-memory window for the day and
+# periodically writes it to its own daily file, so concurrent writers never
+# share a file. The latest window is the merge of the last few days' files.
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from src import config
+from src.monitoring.sketches import FeatureSketch, FixedHistogram, QuantileSketch
+from src.utils.logger import logger
+
+# Floor for bin proportions in the PSI, so empty bins don't produce infinities.
+_PSI_EPSILON = 1e-4
+
+
+class MonitoringWindow:
+    """
+    A set of sketches, one per entry in `FEATURE_LIST` plus predicted
+    probabilities. `model_version` records which model produced the
+    probabilities, since they are only comparable within one version.
+    """
+
+    def __init__(self, sketches, model_version=None):
+        self.sketches = sketches
+        self.model_version = model_version
+
+    @classmethod
+    def with_edges(cls, edges, bins=config.MONITORING_BINS, model_version=None):
+        """Creates an empty window from a {feature: histogram edges} mapping."""
+        sketches = {col: FeatureSketch(FixedHistogram(edges[col])) for col in config.FEATURE_LIST}
+        # Probabilities live in [0, 1], so evenly spaced edges work for any model.
+        sketches[config.PREDICTION_COLUMN] = FeatureSketch(FixedHistogram(np.linspace(0, 1, bins + 1)[1:-1]))
+        return cls(sketches, model_version)
+
+    def update(self, df: pd.DataFrame, probabilities=None):
+        """Folds a batch of feature rows (and optional predicted probabilities) into the window."""
+        for col in config.FEATURE_LIST:
+            self.sketches[col].update(_finite_values(df[col]))
+        if probabilities is not None:
+            self.sketches[config.PREDICTION_COLUMN].update(_finite_values(probabilities))
+
+    def reset_predictions(self, model_version):
+        """Empties the prediction sketch and ties the window to a new model version."""
+        self.sketches[config.PREDICTION_COLUMN] = self.sketches[config.PREDICTION_COLUMN].empty_like()
+        self.model_version = model_version
+
+    def merge(self, other):
+        for name, sketch in self.sketches.items():
+            sketch.merge(other.sketches[name])
+
+    def empty_like(self, model_version=None):
+        return MonitoringWindow({name: sketch.empty_like() for name, sketch in self.sketches.items()},
+                                model_version)
+
+    def save(self, path):
+        """Atomically writes the window to a JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temporary name, so concurrent saves never clobber each other.
+        with tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=f".{path.name}.",
+                                         suffix=".tmp", delete=False) as f:
+            json.dump({
+                'model_version': self.model_version,
+                'sketches': {name: sketch.to_dict() for name, sketch in self.sketches.items()},
+            }, f)
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            payload = json.load(f)
+        sketches = {name: FeatureSketch.from_dict(data) for name, data in payload['sketches'].items()}
+        return cls(sketches, payload['model_version'])
+
+
+def _finite_values(values):
+    values = np.asarray(values, dtype=float)
+    return values[~np.isnan(values)]
+
+
+def population_stability_index(reference: FixedHistogram, current: FixedHistogram):
+    """Returns the PSI between two histograms that share bin edges."""
+    expected = np.clip(reference.proportions(), _PSI_EPSILON, None)
+    actual = np.clip(current.proportions(), _PSI_EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(reference: FixedHistogram, current: FixedHistogram):
+    """Returns the Kolmogorov-Smirnov statistic computed on the binned CDFs."""
+    return float(np.max(np.abs(np.cumsum(reference.proportions()) - np.cumsum(current.proportions()))))
+
+
+def compare_windows(reference: MonitoringWindow, current: MonitoringWindow):
+    """
+    Scores drift of the current window against the reference window.
+
+    Returns:
+        A DataFrame indexed by variable with PSI, KS, the mean shift in
+        reference standard deviations, and a status of "ok", "warning"
+        or "drift". Variables with no current data are skipped, as are
+        predicted probabilities when the two windows come from different
+        model versions.
+    """
+    rows = {}
+    for name, ref_sketch in reference.sketches.items():
+        cur_sketch = current.sketches[name]
+        if ref_sketch.stats.count == 0 or cur_sketch.stats.count == 0:
+            continue
+        if name == config.PREDICTION_COLUMN and reference.model_version != current.model_version:
+            logger.info(f"Skipping prediction drift: reference was scored by model "
+                        f"'{reference.model_version}', latest data by '{current.model_version}'.")
+            continue
+
+        psi = population_stability_index(ref_sketch.histogram, cur_sketch.histogram)
+        ref_std = ref_sketch.stats.std
+        mean_shift = (cur_sketch.stats.mean - ref_sketch.stats.mean) / ref_std if ref_std > 0 else 0.0
+        if psi >= config.PSI_ALERT_THRESHOLD:
+            status = "drift"
+        elif psi >= config.PSI_WARNING_THRESHOLD:
+            status = "warning"
+        else:
+            status = "ok"
+
+        rows[name] = {
+            'psi': psi,
+            'ks': ks_statistic(ref_sketch.histogram, cur_sketch.histogram),
+            'mean_shift_std': mean_shift,
+            'reference_mean': ref_sketch.stats.mean,
+            'current_mean': cur_sketch.stats.mean,
+            'current_count': cur_sketch.stats.count,
+            'status': status,
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def build_reference_window(model=None, bins=config.MONITORING_BINS):
+    """
+    Builds the reference window from the processed dataset, reading it in
+    chunks. A first pass fixes histogram edges from quantile sketches; the
+    second fills every sketch. If a model is given, its predicted
+    probabilities are sketched too and its version is recorded.
+    """
+    logger.info(f"Building monitoring reference window from '{config.PROCESSED_FILE_PATH}'...")
+    if not config.PROCESSED_FILE_PATH.exists():
+        logger.error("Processed data not found. Please run `main_data_pipeline.py` first.")
+        return None
+
+    def read_chunks():
+        return pd.read_csv(config.PROCESSED_FILE_PATH, usecols=config.FEATURE_LIST,
+                           chunksize=config.MONITORING_CHUNK_SIZE)
+
+    edge_sketches = {col: QuantileSketch() for col in config.FEATURE_LIST}
+    for chunk in read_chunks():
+        for col, sketch in edge_sketches.items():
+            sketch.update(_finite_values(chunk[col]))
+    cut_points = np.linspace(0, 1, bins + 1)[1:-1]
+    edges = {col: np.unique(sketch.quantiles(cut_points)) for col, sketch in edge_sketches.items()}
+    window = MonitoringWindow.with_edges(edges, bins, getattr(model, 'version', None))
+
+    for chunk in read_chunks():
+        probabilities = model.predict_proba(chunk)[:, 1] if model is not None else None
+        window.update(chunk, probabilities)
+
+    window.save(config.REFERENCE_WINDOW_PATH)
+    logger.success(f"Reference window saved to '{config.REFERENCE_WINDOW_PATH}'.")
+    return window
+
+
+def load_reference_window():
+    """Loads the saved reference window, or returns None if it hasn't been built."""
+    if not config.REFERENCE_WINDOW_PATH.exists():
+        return None
+    return MonitoringWindow.load(config.REFERENCE_WINDOW_PATH)
+
+
+# Per-process recording state, guarded by `_recorder_lock`. The daily window
+# accumulates everything this process recorded today and is rewritten whole
+# to this process's own file on each flush.
+_recorder_lock = threading.Lock()
+_writer_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+_reference = None
+_reference_mtime = None
+_day = None
+_day_window = None
+_unflushed_rows = 0
+_last_flush = time.monotonic()
+
+
+def _period_path(day):
+    return config.MONITORING_PERIODS_DIR / f"{day.isoformat()}_{_writer_id}.json"
+
+
+def _cached_reference():
+    # Reloaded only when the reference file changes, so recording stays in memory.
+    global _reference, _reference_mtime
+    try:
+        mtime = config.REFERENCE_WINDOW_PATH.stat().st_mtime
+    except FileNotFoundError:
+        _reference, _reference_mtime = None, None
+        return None
+    if mtime != _reference_mtime:
+        _reference, _reference_mtime = load_reference_window(), mtime
+    return _reference
+
+
+def _flush_locked():
+    global _unflushed_rows, _last_flush
+    _last_flush = time.monotonic()
+    if _day_window is None or _unflushed_rows == 0:
+        return
+    _day_window.save(_period_path(_day))
+    _unflushed_rows = 0
+    _prune_periods(_day)
+
+
+def record_batch(df: pd.DataFrame, probabilities=None, model_version=None, day=None):
+    """
+    Folds a new batch into this process's in-memory window for the day.
+    The window is written to disk every `MONITORING_FLUSH_ROWS` rows or
+    `MONITORING_FLUSH_SECONDS` seconds, and at exit. Does nothing if no
+    reference window has been built, since the reference fixes the bins.
+
+    Args:
+        df (pd.DataFrame): New feature rows; columns must include `config.FEATURE_LIST`.
+        probabilities (array-like, optional): Predicted flood probabilities for `df`.
+        model_version (str, optional): The model version that produced `probabilities`.
+        day (datetime.date, optional): The period to record into. Defaults to today.
+    """
+    global _day, _day_window, _unflushed_rows
+    day = day or date.today()
+    with _recorder_lock:
+        if _day_window is None or day != _day:
+            _flush_locked()
+            reference = _cached_reference()
+            if reference is None:
+                logger.debug("No monitoring reference window yet. Skipping batch recording.")
+                return
+            _day, _day_window = day, reference.empty_like(model_version)
+
+        # Probabilities from different models can't be pooled; keep the newest model's.
+        if probabilities is not None and _day_window.model_version != model_version:
+            _day_window.reset_predictions(model_version)
+        _day_window.update(df, probabilities)
+        _unflushed_rows += len(df)
+
+        if (_unflushed_rows >= config.MONITORING_FLUSH_ROWS
+                or time.monotonic() - _last_flush >= config.MONITORING_FLUSH_SECONDS):
+            _flush_locked()
+
+
+def flush_recorded():
+    """Writes any recorded but unflushed data to this process's daily file."""
+    with _recorder_lock:
+        _flush_locked()
+
+
+atexit.register(flush_recorded)
+
+
+def _prune_periods(today):
+    oldest = today - timedelta(days=config.MONITORING_WINDOW_DAYS - 1)
+    for path in config.MONITORING_PERIODS_DIR.glob("*.json"):
+        try:
+            if date.fromisoformat(path.stem.split("_")[0]) < oldest:
+                path.unlink()
+        except (ValueError, FileNotFoundError):
+            continue
+
+
+def load_latest_window(model_version=None, today=None):
+    """
+    Merges the daily windows of every writer from the last
+    `MONITORING_WINDOW_DAYS` days. Prediction sketches from other model
+    versions are left out.
+
+    Returns:
+        The merged window, or None if nothing was recorded in that period.
+    """
+    today = today or date.today()
+    latest = None
+    for offset in range(config.MONITORING_WINDOW_DAYS):
+        day = today - timedelta(days=offset)
+        for path in sorted(config.MONITORING_PERIODS_DIR.glob(f"{day.isoformat()}_*.json")):
+            try:
+                window = MonitoringWindow.load(path)
+            except (OSError, ValueError) as e:
+                # A file pruned or replaced between listing and reading.
+                logger.warning(f"Skipping unreadable monitoring window '{path}': {e}")
+                continue
+            if window.model_version != model_version:
+                window.reset_predictions(model_version)
+            if latest is None:
+                latest = window
+            else:
+                latest.merge(window)
+    return latest
+
+
+def check_drift(model_version=None):
+    """
+    Compares the latest window against the reference window.
+
+    Args:
+        model_version (str, optional): The serving model version. Prediction
+                                       drift is only scored for this version.
+
+    Returns:
+        The drift report DataFrame from `compare_windows`, or None if either
+        window is missing.
+    """
+    flush_recorded()
+    reference = load_reference_window()
+    if reference is None:
+        logger.error("No monitoring reference window found. Build one with `build_reference_window()` first.")
+        return None
+    latest = load_latest_window(model_version)
+    if latest is None:
+        logger.info(f"No data recorded in the last {config.MONITORING_WINDOW_DAYS} days.")
+        return None
+
+    report = compare_windows(reference, latest)
+    drifted = report.index[report['status'] == "drift"].tolist() if not report.empty else []
+    if drifted:
+        logger.warning(f"Data drift detected in: {', '.join(drifted)}")
+    return report
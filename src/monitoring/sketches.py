@@ -0,0 +1,202 @@
+# src/monitoring/sketches.py
+# Incremental, mergeable summary statistics used for monitoring.
+# Every sketch is updated with a batch of values in a single vectorized pass,
+# can be merged with another sketch of the same kind, and round-trips through
+# plain dicts so it can be persisted as JSON.
+
+import numpy as np
+from src import config
+
+
+class RunningStats:
+    """Streaming count, mean, variance, min and max (Chan et al. batch update)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _combine(self, count, mean, m2, min_value, max_value):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, min_value)
+        self.max = max(self.max, max_value)
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        batch_mean = values.mean()
+        self._combine(len(values), batch_mean, ((values - batch_mean) ** 2).sum(),
+                      values.min(), values.max())
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': None if self.count == 0 else self.min,
+                'max': None if self.count == 0 else self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.min = np.inf if data['min'] is None else data['min']
+        stats.max = -np.inf if data['max'] is None else data['max']
+        return stats
+
+
+class FixedHistogram:
+    """
+    Histogram over fixed bin edges, with open-ended first and last bins so
+    every value is counted. Histograms can only be merged or compared when
+    they share the same edges.
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+
+    def update(self, values: np.ndarray):
+        indices = np.searchsorted(self.edges, values, side='right')
+        self.counts += np.bincount(indices, minlength=len(self.counts))
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges.")
+        self.counts += other.counts
+
+    def proportions(self):
+        total = self.counts.sum()
+        return self.counts / total if total else np.zeros(len(self.counts))
+
+    def to_dict(self):
+        return {'edges': self.edges.tolist(), 'counts': self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['edges'])
+        histogram.counts = np.asarray(data['counts'], dtype=np.int64)
+        return histogram
+
+
+class QuantileSketch:
+    """
+    A KLL-style quantile sketch. Values are kept in a hierarchy of compactors
+    where an item at level h stands for 2**h original values; when a level
+    overflows it is sorted and every other item is promoted to the next level.
+    Memory stays roughly O(k) regardless of how many values are added.
+    """
+
+    def __init__(self, k=config.QUANTILE_SKETCH_K, seed=42):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # With an odd number of items, the largest one stays behind.
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                promoted = items[:len(items) - len(keep)][self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    @property
+    def count(self):
+        return int(sum(len(items) << level for level, items in enumerate(self.levels)))
+
+    def quantiles(self, qs):
+        """Returns approximate values at the given quantiles (0-1), or NaNs if empty."""
+        qs = np.asarray(qs, dtype=float)
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return np.full(qs.shape, np.nan)
+        weights = np.concatenate([np.full(len(items_), 2.0 ** level) for level, items_ in enumerate(self.levels)])
+        order = np.argsort(items)
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        return items[order][np.clip(positions, 0, len(items) - 1)]
+
+    def to_dict(self):
+        return {'k': self.k, 'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data['k'])
+        sketch.levels = [np.asarray(items, dtype=float) for items in data['levels']]
+        return sketch
+
+
+class FeatureSketch:
+    """Running stats, a fixed-bin histogram and a quantile sketch for one variable."""
+
+    def __init__(self, histogram: FixedHistogram, stats=None, quantiles=None):
+        self.histogram = histogram
+        self.stats = stats or RunningStats()
+        self.quantiles = quantiles or QuantileSketch()
+
+    def update(self, values: np.ndarray):
+        """Adds a batch of values. Callers are expected to have dropped NaNs."""
+        self.stats.update(values)
+        self.histogram.update(values)
+        self.quantiles.update(values)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.histogram.merge(other.histogram)
+        self.quantiles.merge(other.quantiles)
+
+    def empty_like(self):
+        """Returns an empty sketch with the same histogram edges."""
+        return FeatureSketch(FixedHistogram(self.histogram.edges), quantiles=QuantileSketch(self.quantiles.k))
+
+    def to_dict(self):
+        return {'stats': self.stats.to_dict(), 'histogram': self.histogram.to_dict(),
+                'quantiles': self.quantiles.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(FixedHistogram.from_dict(data['histogram']),
+                   RunningStats.from_dict(data['stats']),
+                   QuantileSketch.from_dict(data['quantiles']))
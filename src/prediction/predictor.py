@@ -1,22 +1,161 @@
 # src/prediction/predictor.py
 # Contains functions for loading the trained model and making predictions.
 
+import threading
+import time
 import joblib
+import numpy as np
 import pandas as pd
+import xgboost as xgb
 from src import config
+from src.monitoring import drift
+from src.utils import model_registry
 from src.utils.logger import logger
 
-def load_model():
-    """Loads the trained XGBoost model from the file."""
+
+class LoadedModel:
+    """
+    A trained booster plus the metadata needed to score with it.
+    Exposes `predict_proba` so callers can treat it like the sklearn model.
+    """
+
+    def __init__(self, booster, version, features, threshold, metadata=None):
+        self.booster = booster
+        self.version = version
+        self.features = features
+        self.threshold = threshold
+        self.metadata = metadata or {}
+        self.dtype_schema = self.metadata.get('dtype_schema', {})
+
+    def _prepare(self, input_df: pd.DataFrame):
+        """
+        Selects the model's features and checks them against the registered
+        schema. Values are passed as floats; NaNs are kept, since XGBoost
+        treats them as missing.
+        """
+        missing = [col for col in self.features if col not in input_df.columns]
+        if missing:
+            raise ValueError(f"Input is missing features required by model '{self.version}': {missing}")
+        features_df = input_df[self.features]
+
+        non_numeric = [col for col in self.features if not pd.api.types.is_numeric_dtype(features_df[col])]
+        if non_numeric:
+            raise ValueError(
+                f"Non-numeric input columns for model '{self.version}': "
+                + ", ".join(f"{col} ({features_df[col].dtype}, expected {self.dtype_schema.get(col, 'numeric')})"
+                            for col in non_numeric)
+            )
+        return features_df.astype('float64')
+
+    def predict_proba(self, input_df: pd.DataFrame):
+        probabilities = self.booster.inplace_predict(self._prepare(input_df))
+        return np.column_stack([1 - probabilities, probabilities])
+
+
+# In-memory model cache. Scoring reads it without locking. The first load
+# blocks; after that, new versions are loaded on a background thread and
+# swapped in once fully loaded. The lock serializes check-and-load so the
+# same version is never loaded twice concurrently.
+_cached_model = None
+_pinned_version = config.PINNED_MODEL_VERSION
+_last_refresh_check = 0.0
+_refresh_thread = None
+_model_lock = threading.Lock()
+
+def _load_legacy_model():
     try:
-        logger.info(f"Loading model from '{config.MODEL_PATH}'...")
+        logger.info(f"Loading legacy model from '{config.MODEL_PATH}'...")
         model = joblib.load(config.MODEL_PATH)
-        logger.success("Model loaded successfully.")
-        return model
     except FileNotFoundError:
         logger.error(f"Model file not found at '{config.MODEL_PATH}'.")
         logger.error("Please run `main_train.py` first to train and save the model.")
         return None
+    logger.success("Legacy model loaded successfully.")
+    return LoadedModel(model.get_booster(), "legacy", config.FEATURE_LIST, config.PREDICTION_THRESHOLD)
+
+def load_model(version=None):
+    """
+    Loads a model from the registry. Uses the pinned version if set,
+    otherwise the promoted one, and falls back to the legacy joblib file
+    if the registry is empty.
+    """
+    version = version or _pinned_version or model_registry.get_current_version()
+    if version is None:
+        return _load_legacy_model()
+
+    try:
+        logger.info(f"Loading model version '{version}' from the registry...")
+        metadata = model_registry.get_metadata(version)
+        booster = model_registry.load_booster(version)
+    except KeyError as e:
+        logger.error(f"{e} Available versions: {model_registry.list_versions()}")
+        return None
+    except xgb.core.XGBoostError as e:
+        logger.error(f"Could not load the booster for model version '{version}': {e}")
+        return None
+    logger.success(f"Model version '{version}' loaded successfully.")
+    return LoadedModel(booster, version, metadata['features'], metadata['threshold'], metadata)
+
+def _swap_model(model):
+    # Callers hold `_model_lock`; rebinding the reference is atomic for readers.
+    global _cached_model
+    previous = _cached_model.version if _cached_model is not None else None
+    _cached_model = model
+    if previous is not None and previous != model.version:
+        logger.info(f"Switched serving model from '{previous}' to '{model.version}'.")
+
+def _refresh_model():
+    """Loads and swaps in the target version if it differs from the cached one."""
+    global _last_refresh_check
+    with _model_lock:
+        _last_refresh_check = time.monotonic()
+        target = _pinned_version or model_registry.get_current_version()
+        if _cached_model is not None and (target is None or target == _cached_model.version):
+            return
+        model = load_model(target)
+        if model is not None:
+            _swap_model(model)
+        elif _cached_model is not None:
+            logger.error(f"Could not load model version '{target}'. Keeping '{_cached_model.version}'.")
+
+def get_model():
+    """
+    Returns the cached model, loading it on first use. Periodically checks
+    the registry on a background thread and hot-swaps to a newly promoted
+    version, so callers never wait on a reload.
+    """
+    global _refresh_thread, _last_refresh_check
+    if _cached_model is None:
+        _refresh_model()
+    elif time.monotonic() - _last_refresh_check >= config.MODEL_REFRESH_SECONDS:
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _last_refresh_check = time.monotonic()
+            _refresh_thread = threading.Thread(target=_refresh_model, name="model-refresh", daemon=True)
+            _refresh_thread.start()
+    return _cached_model
+
+def pin_model(version):
+    """Pins serving to a specific registry version and switches to it immediately."""
+    global _pinned_version
+    with _model_lock:
+        model = load_model(version)
+        if model is None:
+            return False
+        _pinned_version = version
+        _swap_model(model)
+    return True
+
+def unpin_model():
+    """Removes any pin so serving follows the promoted version again."""
+    global _pinned_version
+    _pinned_version = None
+    _refresh_model()
+
+def promote_model(version):
+    """Promotes a registry version and, unless a pin is active, serves it immediately."""
+    model_registry.promote(version)
+    if _pinned_version is None:
+        _refresh_model()
 
 def predict_flood_risk(input_df: pd.DataFrame):
     """
@@ -32,17 +171,19 @@ def predict_flood_risk(input_df: pd.DataFrame):
         - list of probabilities for the positive class (flood)
         Returns (None, None) if the model cannot be loaded.
     """
-    model = load_model()
+    model = get_model()
     if model is None:
         return None, None
 
-    # Ensure columns are in the correct order
-    input_df_ordered = input_df[config.FEATURE_LIST]
-
-    logger.info(f"Making predictions on {len(input_df_ordered)} data points...")
-    probabilities = model.predict_proba(input_df_ordered)[:, 1]
+    logger.info(f"Making predictions on {len(input_df)} data points with model '{model.version}'...")
+    probabilities = model.predict_proba(input_df)[:, 1]
+    try:
+        drift.record_batch(input_df, probabilities, model.version)
+    except Exception as e:
+        # Monitoring is best-effort and must never fail a prediction.
+        logger.error(f"Could not record batch for drift monitoring: {e!r}")
 
-    predictions = ["Flood Risk" if prob >= config.PREDICTION_THRESHOLD else "No Flood Risk" for prob in probabilities]
+    predictions = ["Flood Risk" if prob >= model.threshold else "No Flood Risk" for prob in probabilities]
     logger.success("Prediction complete.")
 
     return predictions, probabilities
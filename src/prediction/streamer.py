@@ -0,0 +1,390 @@
+# src/prediction/streamer.py
+# Contains the real-time streaming scorer. It keeps per-location rolling
+# state in memory so each incoming hourly observation can be turned into
+# model features and scored without re-running the batch processor.
+
+import json
+import math
+import os
+import socket
+import time
+import pandas as pd
+from src import config
+from src.monitoring import drift
+from src.prediction import predictor
+from src.utils.logger import logger
+
+
+class LocationState:
+    """
+    Rolling rainfall window and last-known hydrology values for one grid point.
+
+    Rainfall is kept in a fixed-size ring buffer with running sums and counts
+    of non-missing readings for the short and long windows, so each update is
+    O(1). Missing readings occupy a slot but are left out of the averages,
+    which matches the processor's `rolling(window=N, min_periods=1).mean()`
+    followed by `fillna(0)`.
+    """
+
+    def __init__(self, short_window=config.RAINFALL_SHORT_WINDOW_HRS,
+                 long_window=config.RAINFALL_LONG_WINDOW_HRS):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.buffer = [None] * long_window  # None marks a missing reading
+        self.head = 0   # Index of the next slot to write
+        self.count = 0  # Number of filled slots (capped at long_window)
+        self.short_sum = 0.0
+        self.long_sum = 0.0
+        self.short_valid = 0
+        self.long_valid = 0
+        self.last_discharge = None
+        self.last_proxy = None
+        self.last_timestamp = None
+        self.in_alert = False
+
+    def push_rainfall(self, value):
+        """Adds one hourly rainfall reading (or None if missing) to the ring buffer."""
+        if self.count >= self.long_window:
+            evicted = self.buffer[self.head]
+            if evicted is not None:
+                self.long_sum -= evicted
+                self.long_valid -= 1
+        if self.count >= self.short_window:
+            evicted = self.buffer[(self.head - self.short_window) % self.long_window]
+            if evicted is not None:
+                self.short_sum -= evicted
+                self.short_valid -= 1
+
+        self.buffer[self.head] = value
+        if value is not None:
+            self.long_sum += value
+            self.short_sum += value
+            self.long_valid += 1
+            self.short_valid += 1
+        self.head = (self.head + 1) % self.long_window
+        self.count = min(self.count + 1, self.long_window)
+
+        # Resync the running sums once per lap to stop floating-point drift.
+        if self.head == 0:
+            self._recompute_sums()
+
+    def _recompute_sums(self):
+        long_values = [self.buffer[(self.head - i - 1) % self.long_window] for i in range(self.count)]
+        long_values = [v for v in long_values if v is not None]
+        short_values = [self.buffer[(self.head - i - 1) % self.long_window]
+                        for i in range(min(self.count, self.short_window))]
+        short_values = [v for v in short_values if v is not None]
+        self.long_sum, self.long_valid = sum(long_values), len(long_values)
+        self.short_sum, self.short_valid = sum(short_values), len(short_values)
+
+    @property
+    def rainfall_short_avg(self):
+        return self.short_sum / self.short_valid if self.short_valid else 0.0
+
+    @property
+    def rainfall_long_avg(self):
+        return self.long_sum / self.long_valid if self.long_valid else 0.0
+
+    def to_dict(self):
+        return {
+            'buffer': self.buffer, 'head': self.head, 'count': self.count,
+            'last_discharge': self.last_discharge, 'last_proxy': self.last_proxy,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            'in_alert': self.in_alert,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        if len(data['buffer']) != state.long_window:
+            raise ValueError("Snapshot window length does not match the configured rainfall window.")
+        state.buffer = [None if v is None else float(v) for v in data['buffer']]
+        state.head = data['head']
+        state.count = data['count']
+        state.last_discharge = data['last_discharge']
+        state.last_proxy = data['last_proxy']
+        state.last_timestamp = pd.Timestamp(data['last_timestamp']) if data['last_timestamp'] else None
+        state.in_alert = data['in_alert']
+        state._recompute_sums()
+        return state
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def load_terrain_lookup():
+    """Loads static terrain data into a {(lat, lon): (elevation, slope)} lookup."""
+    try:
+        terrain_df = pd.read_csv(config.TERRAIN_DATA_FILEPATH)
+    except FileNotFoundError:
+        logger.warning(f"Terrain data not found at '{config.TERRAIN_DATA_FILEPATH}'. "
+                       "Observations must carry their own terrain values.")
+        return {}
+    return {
+        (round(row.lat, 2), round(row.lon, 2)): (row.elevation_m, row.slope_degrees)
+        for row in terrain_df.itertuples(index=False)
+    }
+
+
+class StreamScorer:
+    """
+    Scores hourly observations one at a time as they arrive.
+
+    Each observation is a dict with at least `lat`, `lon`, `timestamp` and
+    `rainfall_mm_per_hr`. `river_discharge_m3s` and `high_alt_temp_proxy` are
+    optional and forward-filled from the last value seen for the location.
+    Terrain values are taken from the observation or the static terrain file.
+    """
+
+    def __init__(self, model=None, threshold=None,
+                 state_path=config.STREAM_STATE_PATH, snapshot_every=config.STREAM_SNAPSHOT_EVERY,
+                 terrain=None, on_alert=None):
+        # Without an explicit model, follow the predictor's cache so a newly
+        # promoted registry version is picked up without restarting.
+        self.model = model
+        if self._current_model() is None:
+            raise RuntimeError("No trained model available for streaming scoring.")
+        self.threshold = threshold
+        self.state_path = state_path
+        self.snapshot_every = snapshot_every
+        self.terrain = terrain if terrain is not None else load_terrain_lookup()
+        self.on_alert = on_alert
+        self.states = {}
+        self._since_snapshot = 0
+        # Scored rows waiting to be recorded for drift monitoring on the next snapshot.
+        self._monitor_rows = []
+        self._monitor_probabilities = []
+        self._monitor_version = None
+
+    def _current_model(self):
+        return self.model if self.model is not None else predictor.get_model()
+
+    def update(self, observation):
+        """
+        Folds one observation into the location's rolling state and returns
+        its feature row, or None if the observation is stale (already seen).
+        """
+        key = (round(float(observation['lat']), 2), round(float(observation['lon']), 2))
+        timestamp = pd.Timestamp(observation['timestamp'])
+
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = LocationState()
+        elif state.last_timestamp is not None and timestamp <= state.last_timestamp:
+            logger.debug(f"Skipping stale observation for {key} at {timestamp}.")
+            return None
+
+        rainfall = observation.get('rainfall_mm_per_hr')
+        rainfall = None if _is_missing(rainfall) else float(rainfall)
+        state.push_rainfall(rainfall)
+
+        discharge = observation.get('river_discharge_m3s')
+        if not _is_missing(discharge):
+            state.last_discharge = float(discharge)
+        proxy = observation.get('high_alt_temp_proxy')
+        if not _is_missing(proxy):
+            state.last_proxy = float(proxy)
+        state.last_timestamp = timestamp
+
+        elevation, slope = self.terrain.get(key, (0.0, 0.0))
+        if not _is_missing(observation.get('elevation_m')):
+            elevation = observation['elevation_m']
+        if not _is_missing(observation.get('slope_degrees')):
+            slope = observation['slope_degrees']
+
+        # Missing values default to 0, as in the processor's final fillna(0).
+        return {
+            'lat': key[0], 'lon': key[1],
+            'rainfall_mm_per_hr': rainfall if rainfall is not None else 0.0,
+            'rainfall_24hr_avg': state.rainfall_short_avg,
+            'rainfall_72hr_avg': state.rainfall_long_avg,
+            'month': timestamp.month, 'day_of_year': timestamp.dayofyear, 'hour': timestamp.hour,
+            'elevation_m': elevation, 'slope_degrees': slope,
+            'river_discharge_m3s': state.last_discharge if state.last_discharge is not None else 0.0,
+            'high_alt_temp_proxy': state.last_proxy if state.last_proxy is not None else 0.0,
+        }
+
+    def score(self, observation):
+        """
+        Updates state with one observation and scores it.
+
+        Returns:
+            A dict with the features, probability, prediction and any alert
+            ("RAISED" or "CLEARED") emitted for this observation, or None if
+            the observation was stale.
+        """
+        features = self.update(observation)
+        if features is None:
+            return None
+
+        model = self._current_model()
+        threshold = self.threshold
+        if threshold is None:
+            threshold = getattr(model, 'threshold', config.PREDICTION_THRESHOLD)
+
+        row = pd.DataFrame([features], columns=config.FEATURE_LIST)
+        probability = float(model.predict_proba(row)[0, 1])
+        is_risk = probability >= threshold
+        self._buffer_for_monitoring(features, probability, getattr(model, 'version', None))
+
+        state = self.states[(features['lat'], features['lon'])]
+        alert = None
+        if is_risk and not state.in_alert:
+            alert = "RAISED"
+        elif not is_risk and state.in_alert:
+            alert = "CLEARED"
+        state.in_alert = is_risk
+
+        result = {
+            'lat': features['lat'], 'lon': features['lon'],
+            'timestamp': state.last_timestamp.isoformat(),
+            'probability': probability,
+            'prediction': "Flood Risk" if is_risk else "No Flood Risk",
+            'alert': alert,
+            'features': features,
+        }
+        if alert is not None:
+            self._emit_alert(result)
+
+        self._since_snapshot += 1
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        return result
+
+    def _buffer_for_monitoring(self, features, probability, model_version):
+        if model_version != self._monitor_version:
+            self._flush_monitoring()
+            self._monitor_version = model_version
+        self._monitor_rows.append(features)
+        self._monitor_probabilities.append(probability)
+
+    def _flush_monitoring(self):
+        if not self._monitor_rows:
+            return
+        try:
+            drift.record_batch(pd.DataFrame(self._monitor_rows, columns=config.FEATURE_LIST),
+                               self._monitor_probabilities, self._monitor_version)
+            drift.flush_recorded()
+        except Exception as e:
+            # Monitoring is best-effort and must never stop the stream.
+            logger.error(f"Could not record scored rows for drift monitoring: {e!r}")
+        self._monitor_rows = []
+        self._monitor_probabilities = []
+
+    def _emit_alert(self, result):
+        if result['alert'] == "RAISED":
+            logger.warning(f"FLOOD ALERT RAISED at ({result['lat']}, {result['lon']}) "
+                           f"{result['timestamp']}: probability {result['probability']:.2%}")
+        else:
+            logger.info(f"Flood alert cleared at ({result['lat']}, {result['lon']}) "
+                        f"{result['timestamp']}: probability {result['probability']:.2%}")
+        if self.on_alert is not None:
+            self.on_alert(result)
+
+    def run(self, source):
+        """
+        Scores every observation from an iterable source, snapshotting on exit.
+        Malformed observations are logged and skipped so one bad record doesn't
+        stop a live stream.
+        """
+        scored = 0
+        try:
+            for observation in source:
+                try:
+                    result = self.score(observation)
+                except (KeyError, ValueError, TypeError) as e:
+                    logger.error(f"Skipping malformed observation {observation!r}: {e!r}")
+                    continue
+                if result is not None:
+                    scored += 1
+        finally:
+            self.snapshot()
+            logger.info(f"Streaming scorer processed {scored} new observations.")
+        return scored
+
+    def snapshot(self):
+        """
+        Atomically writes the rolling state of every location to disk and
+        records the rows scored since the last snapshot for drift monitoring.
+        """
+        self._flush_monitoring()
+        payload = {f"{lat},{lon}": state.to_dict() for (lat, lon), state in self.states.items()}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.state_path)
+        self._since_snapshot = 0
+        logger.debug(f"Stream state for {len(payload)} locations saved to '{self.state_path}'.")
+
+    def restore(self):
+        """Loads a previous snapshot, if one exists. Returns True on success."""
+        if not self.state_path.exists():
+            logger.info("No stream state snapshot found. Starting with empty state.")
+            return False
+        try:
+            with open(self.state_path) as f:
+                payload = json.load(f)
+            self.states = {
+                tuple(float(v) for v in key.split(',')): LocationState.from_dict(data)
+                for key, data in payload.items()
+            }
+        except (ValueError, KeyError) as e:
+            logger.error(f"Could not restore stream state from '{self.state_path}': {e}. Starting fresh.")
+            self.states = {}
+            return False
+        logger.success(f"Restored stream state for {len(self.states)} locations.")
+        return True
+
+
+def _parse_line(line):
+    """Parses one JSON observation line, returning None (and logging) if it is invalid."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        observation = json.loads(line)
+    except json.JSONDecodeError as e:
+        logger.error(f"Skipping malformed observation line {line!r}: {e}")
+        return None
+    if not isinstance(observation, dict):
+        logger.error(f"Skipping observation that is not a JSON object: {line!r}")
+        return None
+    return observation
+
+
+def file_source(path, follow=False, poll_interval=1.0):
+    """
+    Yields observations from a newline-delimited JSON file. With `follow=True`
+    the file is tailed like `tail -f` and new lines are yielded as they appear;
+    a line is only parsed once its trailing newline has been written.
+    """
+    with open(path) as f:
+        pending = ""
+        while True:
+            pending += f.readline()
+            if not pending.endswith("\n"):
+                if follow:
+                    # Partial line (or nothing new): wait for the writer to finish it.
+                    time.sleep(poll_interval)
+                    continue
+                if pending:
+                    observation = _parse_line(pending)
+                    if observation is not None:
+                        yield observation
+                return
+            observation = _parse_line(pending)
+            pending = ""
+            if observation is not None:
+                yield observation
+
+
+def socket_source(host, port):
+    """Yields observations sent as newline-delimited JSON over a TCP socket."""
+    with socket.create_connection((host, port)) as sock, sock.makefile('r') as stream:
+        logger.info(f"Connected to observation stream at {host}:{port}.")
+        for line in stream:
+            observation = _parse_line(line)
+            if observation is not None:
+                yield observation
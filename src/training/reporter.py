@@ -0,0 +1,163 @@
+# src/training/reporter.py
+# Contains the model evaluation reporting stage.
+# Reports run on a background worker after a model version is registered,
+# so training does not wait on evaluation or plotting. Outputs are written
+# per model version and reused if that version has already been reported.
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.calibration import calibration_curve
+from sklearn.metrics import (average_precision_score, brier_score_loss, classification_report,
+                             confusion_matrix, precision_recall_curve)
+from src import config
+from src.utils import model_registry
+from src.utils.logger import logger
+
+REPORT_FILENAME = "report.json"
+
+# A single worker keeps reports ordered and avoids competing with training for CPU.
+# Its thread is joined at interpreter exit, so queued reports still finish.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reporting")
+
+
+def report_dir(version):
+    return config.REPORTS_DIR / version
+
+
+def load_report(version):
+    """Returns the cached report for a model version, or None if it hasn't been generated."""
+    report_path = report_dir(version) / REPORT_FILENAME
+    if not report_path.exists():
+        return None
+    with open(report_path) as f:
+        return json.load(f)
+
+
+def compute_attributions(booster: xgb.Booster, X: pd.DataFrame, sample_size=config.REPORT_ATTRIBUTION_SAMPLE_SIZE):
+    """
+    Computes per-feature attributions on a sample of rows.
+
+    Returns:
+        A DataFrame indexed by feature with the mean absolute SHAP value
+        (from XGBoost's vectorized TreeSHAP) and the total gain.
+    """
+    sample = X.sample(n=min(sample_size, len(X)), random_state=42)
+    # The last column of the contributions matrix is the bias term.
+    contributions = booster.predict(xgb.DMatrix(sample), pred_contribs=True)[:, :-1]
+    gain = booster.get_score(importance_type='total_gain')
+    attributions = pd.DataFrame({
+        'mean_abs_shap': np.abs(contributions).mean(axis=0),
+        'total_gain': [gain.get(feature, 0.0) for feature in sample.columns],
+    }, index=sample.columns)
+    return attributions.sort_values('mean_abs_shap', ascending=False)
+
+
+def _save_plots(output_dir, attributions, pr_curve, calibration):
+    # Imported here so matplotlib's import cost stays off the training path.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    attributions['mean_abs_shap'].iloc[::-1].plot.barh(ax=ax)
+    ax.set_title("Feature Importance (mean |SHAP|)")
+    ax.set_xlabel("Mean absolute SHAP value")
+    fig.tight_layout()
+    fig.savefig(output_dir / "feature_importance.png")
+    plt.close(fig)
+
+    precision, recall, _ = pr_curve
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.plot(recall, precision)
+    ax.set_title("Precision-Recall Curve")
+    ax.set_xlabel("Recall")
+    ax.set_ylabel("Precision")
+    fig.tight_layout()
+    fig.savefig(output_dir / "precision_recall_curve.png")
+    plt.close(fig)
+
+    prob_true, prob_pred = calibration
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.plot([0, 1], [0, 1], linestyle='--', color='grey', label="Perfectly calibrated")
+    ax.plot(prob_pred, prob_true, marker='o', label="Model")
+    ax.set_title("Calibration Curve")
+    ax.set_xlabel("Mean predicted probability")
+    ax.set_ylabel("Observed flood frequency")
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(output_dir / "calibration_curve.png")
+    plt.close(fig)
+
+
+def generate_report(version, X_test: pd.DataFrame, y_test: pd.Series, force=False):
+    """
+    Evaluates a registered model version and writes its report to disk.
+
+    Args:
+        version (str): The registry version to evaluate.
+        X_test (pd.DataFrame): Held-out features.
+        y_test (pd.Series): Held-out labels.
+        force (bool): Regenerate even if a cached report exists.
+
+    Returns:
+        The report dict (also saved as `report.json` in the version's report directory).
+    """
+    if not force:
+        cached = load_report(version)
+        if cached is not None:
+            logger.info(f"Using cached evaluation report for model version '{version}'.")
+            return cached
+
+    logger.info(f"Generating evaluation report for model version '{version}'...")
+    metadata = model_registry.get_metadata(version)
+    booster = model_registry.load_booster(version)
+    X_test = X_test[metadata['features']]
+
+    probabilities = booster.inplace_predict(X_test)
+    predictions = (probabilities >= metadata['threshold']).astype(int)
+    text_report = classification_report(y_test, predictions)
+    matrix = confusion_matrix(y_test, predictions)
+    logger.info(f"Classification Report ({version}):\n{text_report}")
+    logger.info(f"Confusion Matrix ({version}):\n{matrix}")
+
+    pr_curve = precision_recall_curve(y_test, probabilities)
+    calibration = calibration_curve(y_test, probabilities, n_bins=config.REPORT_CALIBRATION_BINS)
+    attributions = compute_attributions(booster, X_test)
+
+    output_dir = report_dir(version)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    attributions.to_csv(output_dir / "feature_attributions.csv", index_label='feature')
+    _save_plots(output_dir, attributions, pr_curve, calibration)
+
+    report = {
+        'version': version,
+        'test_rows': len(X_test),
+        'classification_report': classification_report(y_test, predictions, output_dict=True),
+        'confusion_matrix': matrix.tolist(),
+        'pr_auc': float(average_precision_score(y_test, probabilities)),
+        'brier_score': float(brier_score_loss(y_test, probabilities)),
+        'calibration_curve': {'mean_predicted': calibration[1].tolist(), 'fraction_positive': calibration[0].tolist()},
+        'attributions': attributions.to_dict(orient='index'),
+    }
+    # Written last, so its presence marks a complete report.
+    with open(output_dir / REPORT_FILENAME, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.success(f"Evaluation report for model version '{version}' saved to '{output_dir}'.")
+    return report
+
+
+def _log_failure(future):
+    if future.exception() is not None:
+        logger.opt(exception=future.exception()).error("Background evaluation report failed.")
+
+
+def submit_report(version, X_test: pd.DataFrame, y_test: pd.Series):
+    """Queues `generate_report` on the background worker and returns its Future."""
+    logger.info(f"Queued evaluation report for model version '{version}' on the background worker.")
+    future = _executor.submit(generate_report, version, X_test.copy(), y_test.copy())
+    future.add_done_callback(_log_failure)
+    return future
+
@@ -4,17 +4,21 @@
 import pandas as pd
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix
-import joblib
-import matplotlib.pyplot as plt
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
 import sys
 from src import config
+from src.training import reporter
+from src.utils import model_registry
 from src.utils.logger import logger
 
 def train_model():
     """
-    Loads the final training data, trains an XGBoost model, evaluates it,
-    and saves the model artifact and a feature importance plot.
+    Loads the final training data, trains an XGBoost model, registers and
+    promotes it as a new model version, and queues the detailed evaluation
+    report on a background worker.
+
+    Returns:
+        The registered model version.
     """
     logger.info("--- Starting Model Training ---")
 
@@ -57,27 +61,25 @@ def train_model():
     model.fit(X_train, y_train)
     logger.success("Model training complete.")
 
-    logger.info("\n--- Model Evaluation on Test Set ---")
-    predictions = model.predict(X_test)
-    report = classification_report(y_test, predictions)
-    matrix = confusion_matrix(y_test, predictions)
-
-    print("\nClassification Report:\n", report)
-    print("\nConfusion Matrix:\n", matrix)
-    logger.info(f"Classification Report:\n{report}")
-    logger.info(f"Confusion Matrix:\n{matrix}")
+    # Only headline metrics are computed here, for the registry metadata.
+    # Plots and the full report are produced off the critical path.
+    probabilities = model.predict_proba(X_test)[:, 1]
+    predictions = (probabilities >= config.PREDICTION_THRESHOLD).astype(int)
+    metrics = {
+        'accuracy': accuracy_score(y_test, predictions),
+        'precision': precision_score(y_test, predictions, zero_division=0),
+        'recall': recall_score(y_test, predictions, zero_division=0),
+        'f1': f1_score(y_test, predictions, zero_division=0),
+        'roc_auc': roc_auc_score(y_test, probabilities),
+        'test_rows': len(X_test),
+    }
+    logger.info(f"Test set metrics: {metrics}")
 
-    logger.info(f"Saving trained model to '{config.MODEL_PATH}'...")
-    joblib.dump(model, config.MODEL_PATH)
-    logger.success("Model saved successfully.")
+    logger.info(f"Registering trained model in '{config.MODEL_REGISTRY_DIR}'...")
+    version = model_registry.register_model(model, df, metrics)
+    model_registry.promote(version)
 
-    # Create and save feature importance plot
-    logger.info("Generating feature importance plot...")
-    fig, ax = plt.subplots(figsize=(12, 8))
-    xgb.plot_importance(model, ax=ax, title="Feature Importance")
-    plt.tight_layout()
-    plt.savefig(config.FEATURE_IMPORTANCE_PATH)
-    logger.success(f"Feature importance plot saved to '{config.FEATURE_IMPORTANCE_PATH}'")
+    reporter.submit_report(version, X_test, y_test)
 
     logger.success("Model training and artifact saving complete.")
-
+    return version
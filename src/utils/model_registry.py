@@ -0,0 +1,138 @@
+# src/utils/model_registry.py
+# A simple local, file-based model registry.
+# Each version lives in its own directory holding the booster in XGBoost's
+# native UBJSON format plus a metadata.json file. A small pointer file marks
+# the promoted ("current") version and is swapped atomically.
+
+import json
+import os
+import shutil
+import hashlib
+from datetime import datetime
+import pandas as pd
+import xgboost as xgb
+from src import config
+from src.utils.logger import logger
+
+BOOSTER_FILENAME = "model.ubj"
+METADATA_FILENAME = "metadata.json"
+CURRENT_POINTER_FILENAME = "CURRENT"
+
+
+def _version_dir(version):
+    return config.MODEL_REGISTRY_DIR / version
+
+
+def _atomic_write_json(path, payload):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def fingerprint_dataframe(df: pd.DataFrame):
+    """Returns a SHA-256 fingerprint of a DataFrame's contents and columns."""
+    digest = hashlib.sha256()
+    digest.update(",".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def list_versions():
+    """Returns all registered versions, oldest first."""
+    if not config.MODEL_REGISTRY_DIR.exists():
+        return []
+    return sorted(
+        p.name for p in config.MODEL_REGISTRY_DIR.iterdir()
+        if p.is_dir() and p.name.startswith("v") and (p / METADATA_FILENAME).exists()
+    )
+
+
+def _next_version():
+    versions = list_versions()
+    last = int(versions[-1][1:]) if versions else 0
+    return f"v{last + 1:04d}"
+
+
+def register_model(model: xgb.XGBClassifier, training_df: pd.DataFrame, metrics: dict,
+                   threshold=config.PREDICTION_THRESHOLD):
+    """
+    Saves a trained model as a new registry version.
+
+    Args:
+        model (xgb.XGBClassifier): The fitted classifier.
+        training_df (pd.DataFrame): The dataset the model was trained on, used
+                                    for the data fingerprint and dtype schema.
+        metrics (dict): Evaluation metrics to store alongside the model.
+        threshold (float): The decision threshold for the positive class.
+
+    Returns:
+        The new version name (e.g. "v0003").
+    """
+    config.MODEL_REGISTRY_DIR.mkdir(parents=True, exist_ok=True)
+    version = _next_version()
+
+    # Build the version in a temporary directory, then rename it into place
+    # so readers never see a half-written version.
+    tmp_dir = config.MODEL_REGISTRY_DIR / f".{version}.tmp"
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir()
+
+    model.get_booster().save_model(str(tmp_dir / BOOSTER_FILENAME))
+    metadata = {
+        'version': version,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'xgboost_version': xgb.__version__,
+        'features': list(config.FEATURE_LIST),
+        'dtype_schema': {col: str(training_df[col].dtype) for col in config.FEATURE_LIST},
+        'threshold': threshold,
+        'training_data_fingerprint': fingerprint_dataframe(training_df),
+        'training_rows': len(training_df),
+        'metrics': metrics,
+    }
+    with open(tmp_dir / METADATA_FILENAME, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    os.rename(tmp_dir, _version_dir(version))
+    logger.success(f"Registered model version '{version}' in '{config.MODEL_REGISTRY_DIR}'.")
+    return version
+
+
+def get_metadata(version):
+    """Returns the metadata dict for a registered version."""
+    metadata_path = _version_dir(version) / METADATA_FILENAME
+    if not metadata_path.exists():
+        raise KeyError(f"Model version '{version}' is not registered.")
+    with open(metadata_path) as f:
+        return json.load(f)
+
+
+def load_booster(version):
+    """Loads the native XGBoost booster for a registered version."""
+    booster_path = _version_dir(version) / BOOSTER_FILENAME
+    if not booster_path.exists():
+        raise KeyError(f"Model version '{version}' is not registered.")
+    booster = xgb.Booster()
+    booster.load_model(str(booster_path))
+    return booster
+
+
+def get_current_version():
+    """Returns the promoted version, or None if nothing has been promoted."""
+    pointer_path = config.MODEL_REGISTRY_DIR / CURRENT_POINTER_FILENAME
+    try:
+        with open(pointer_path) as f:
+            return json.load(f)['version']
+    except FileNotFoundError:
+        return None
+
+
+def promote(version):
+    """Atomically marks a registered version as the current one."""
+    get_metadata(version)  # Raises if the version does not exist
+    _atomic_write_json(config.MODEL_REGISTRY_DIR / CURRENT_POINTER_FILENAME, {
+        'version': version,
+        'promoted_at': datetime.now().isoformat(timespec='seconds'),
+    })
+    logger.success(f"Promoted model version '{version}' to current.")
@@ -0,0 +1,145 @@
+# tests/test_monitoring.py
+# Checks for the monitoring sketches and drift recording: merged sketches
+# must agree with a single pass, quantiles must stay within their error
+# bounds, windows must round-trip through JSON, and concurrent recording
+# must not lose rows.
+
+import threading
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+from src import config
+from src.monitoring import drift
+from src.monitoring.sketches import FeatureSketch, FixedHistogram, QuantileSketch, RunningStats
+
+
+@pytest.fixture(autouse=True)
+def monitoring_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'REFERENCE_WINDOW_PATH', tmp_path / "reference_window.json")
+    monkeypatch.setattr(config, 'MONITORING_PERIODS_DIR', tmp_path / "daily")
+    monkeypatch.setattr(config, 'MONITORING_FLUSH_ROWS', 10 ** 9)
+    monkeypatch.setattr(config, 'MONITORING_FLUSH_SECONDS', 10 ** 9)
+    for name in ['_reference', '_reference_mtime', '_day', '_day_window']:
+        monkeypatch.setattr(drift, name, None)
+    monkeypatch.setattr(drift, '_unflushed_rows', 0)
+
+
+def _chunks(values, sizes):
+    return np.split(values, np.cumsum(sizes)[:-1])
+
+
+def _reference_window(rows=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({col: rng.normal(size=rows) for col in config.FEATURE_LIST})
+    edges = {col: np.quantile(df[col], np.linspace(0, 1, config.MONITORING_BINS + 1)[1:-1])
+             for col in config.FEATURE_LIST}
+    window = drift.MonitoringWindow.with_edges(edges, model_version="v1")
+    window.update(df, rng.random(rows))
+    return window
+
+
+def test_merged_running_stats_match_single_pass():
+    values = np.random.default_rng(1).normal(loc=5, scale=3, size=10_000)
+    merged = RunningStats()
+    for chunk in _chunks(values, [1, 999, 4000, 5000]):
+        part = RunningStats()
+        part.update(chunk)
+        merged.merge(part)
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.variance == pytest.approx(np.var(values, ddof=1), rel=1e-10)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_quantile_sketch_stays_within_rank_error():
+    values = np.random.default_rng(2).lognormal(size=200_000)
+    sketch = QuantileSketch()
+    for chunk in _chunks(values, [50_000] * 4):
+        part = QuantileSketch()
+        part.update(chunk)
+        sketch.merge(part)
+
+    assert sketch.count == len(values)
+    qs = np.linspace(0.01, 0.99, 99)
+    estimates = sketch.quantiles(qs)
+    # Compare in rank space: the fraction of values below each estimate.
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    assert np.max(np.abs(ranks - qs)) < 0.02
+    np.testing.assert_allclose(estimates[[9, 49, 89]], np.quantile(values, qs[[9, 49, 89]]), rtol=0.1)
+
+
+def test_histogram_merge_requires_matching_edges():
+    histogram = FixedHistogram([0.0, 1.0])
+    histogram.update(np.array([-1.0, 0.5, 0.5, 3.0]))
+    assert histogram.counts.tolist() == [1, 2, 1]
+    with pytest.raises(ValueError):
+        histogram.merge(FixedHistogram([0.0, 2.0]))
+
+
+def test_window_round_trips_through_json(tmp_path):
+    window = _reference_window()
+    path = tmp_path / "window.json"
+    window.save(path)
+    loaded = drift.MonitoringWindow.load(path)
+
+    assert loaded.model_version == "v1"
+    for name, sketch in window.sketches.items():
+        assert FeatureSketch.from_dict(sketch.to_dict()).to_dict() == sketch.to_dict()
+        assert loaded.sketches[name].to_dict() == sketch.to_dict()
+
+
+def test_drift_is_flagged_only_for_shifted_feature():
+    reference = _reference_window()
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({col: rng.normal(size=2000) for col in config.FEATURE_LIST})
+    df['rainfall_mm_per_hr'] += 2
+    current = reference.empty_like("v1")
+    current.update(df, rng.random(2000))
+
+    report = drift.compare_windows(reference, current)
+    assert report.loc['rainfall_mm_per_hr', 'status'] == "drift"
+    assert report.loc['rainfall_mm_per_hr', 'ks'] > 0.5
+    assert set(report.index[report['status'] == "drift"]) == {'rainfall_mm_per_hr'}
+
+
+def test_concurrent_recording_keeps_every_row():
+    _reference_window().save(config.REFERENCE_WINDOW_PATH)
+    rng = np.random.default_rng(4)
+    batches = [pd.DataFrame({col: rng.normal(size=50) for col in config.FEATURE_LIST}) for _ in range(40)]
+    errors = []
+
+    def record(worker):
+        try:
+            for batch in batches[worker::4]:
+                drift.record_batch(batch, rng.random(len(batch)), "v1")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert drift.load_latest_window("v1") is None  # Still buffered in memory.
+
+    drift.flush_recorded()
+    latest = drift.load_latest_window("v1")
+    assert latest.sketches['rainfall_mm_per_hr'].stats.count == 2000
+    assert latest.sketches[config.PREDICTION_COLUMN].stats.count == 2000
+
+
+def test_latest_window_merges_writers_and_drops_other_model_predictions():
+    reference = _reference_window()
+    rng = np.random.default_rng(5)
+    today = date.today()
+    for writer, version in [("a", "v1"), ("b", "v0")]:
+        window = reference.empty_like(version)
+        window.update(pd.DataFrame({col: rng.normal(size=100) for col in config.FEATURE_LIST}), rng.random(100))
+        window.save(config.MONITORING_PERIODS_DIR / f"{today.isoformat()}_{writer}.json")
+
+    latest = drift.load_latest_window("v1", today)
+    assert latest.sketches['rainfall_mm_per_hr'].stats.count == 200
+    assert latest.sketches[config.PREDICTION_COLUMN].stats.count == 100
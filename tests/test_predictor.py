@@ -0,0 +1,118 @@
+# tests/test_predictor.py
+# Checks for the model registry and the predictor's versioned model cache:
+# native-format round trips, promotion and pinning, the legacy fallback,
+# and keeping the serving model when a new booster is corrupt.
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from src import config
+from src.prediction import predictor
+from src.utils import model_registry
+
+
+def _training_data(rows=400):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({col: rng.normal(size=rows) for col in config.FEATURE_LIST})
+    for col in ['month', 'day_of_year', 'hour']:
+        df[col] = rng.integers(1, 24, size=rows)
+    df[config.TARGET_VARIABLE] = (df['rainfall_mm_per_hr'] + rng.normal(scale=0.5, size=rows) > 0.8).astype(int)
+    return df
+
+
+def _fit(df, n_estimators):
+    model = xgb.XGBClassifier(n_estimators=n_estimators, max_depth=3, random_state=42)
+    model.fit(df[config.FEATURE_LIST], df[config.TARGET_VARIABLE])
+    return model
+
+
+@pytest.fixture(scope='module')
+def training_df():
+    return _training_data()
+
+
+@pytest.fixture(scope='module')
+def models(training_df):
+    return _fit(training_df, 10), _fit(training_df, 30)
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'MODEL_REGISTRY_DIR', tmp_path / "registry")
+    monkeypatch.setattr(config, 'MODEL_PATH', tmp_path / "legacy.joblib")
+    monkeypatch.setattr(config, 'MODEL_REFRESH_SECONDS', 3600)
+    monkeypatch.setattr(predictor, '_cached_model', None)
+    monkeypatch.setattr(predictor, '_pinned_version', None)
+    monkeypatch.setattr(predictor, '_last_refresh_check', 0.0)
+    monkeypatch.setattr(predictor, '_refresh_thread', None)
+
+
+def test_registered_booster_matches_sklearn_model(training_df, models):
+    model = models[0]
+    version = model_registry.register_model(model, training_df, {'roc_auc': 0.9})
+
+    metadata = model_registry.get_metadata(version)
+    assert metadata['features'] == config.FEATURE_LIST
+    assert metadata['dtype_schema']['hour'] == str(training_df['hour'].dtype)
+    assert metadata['training_data_fingerprint'] == model_registry.fingerprint_dataframe(training_df)
+
+    loaded = predictor.LoadedModel(model_registry.load_booster(version), version,
+                                   metadata['features'], metadata['threshold'], metadata)
+    X = training_df[config.FEATURE_LIST]
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=1e-6)
+
+
+def test_scoring_keeps_nans_and_fractional_values(training_df, models):
+    model = models[0]
+    version = model_registry.register_model(model, training_df, {})
+    model_registry.promote(version)
+    loaded = predictor.get_model()
+
+    X = training_df[config.FEATURE_LIST].head(5).astype('float64')
+    X.loc[0, 'hour'] = np.nan
+    X.loc[1, 'hour'] = 16.7
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=1e-6)
+
+    X['month'] = X['month'].astype(str)
+    with pytest.raises(ValueError, match="month"):
+        loaded.predict_proba(X)
+
+
+def test_promote_pin_and_unpin_switch_serving_model(training_df, models):
+    first = model_registry.register_model(models[0], training_df, {})
+    second = model_registry.register_model(models[1], training_df, {})
+    model_registry.promote(first)
+    assert predictor.get_model().version == first
+
+    predictor.promote_model(second)
+    assert predictor.get_model().version == second
+
+    assert predictor.pin_model(first)
+    predictor.promote_model(second)
+    assert predictor.get_model().version == first
+
+    predictor.unpin_model()
+    assert predictor.get_model().version == second
+
+
+def test_falls_back_to_legacy_model_when_registry_is_empty(training_df, models):
+    joblib.dump(models[0], config.MODEL_PATH)
+    loaded = predictor.get_model()
+    assert loaded.version == "legacy"
+
+    X = training_df[config.FEATURE_LIST]
+    np.testing.assert_allclose(loaded.predict_proba(X), models[0].predict_proba(X), rtol=1e-6)
+
+
+def test_corrupt_booster_keeps_current_model(training_df, models):
+    first = model_registry.register_model(models[0], training_df, {})
+    second = model_registry.register_model(models[1], training_df, {})
+    model_registry.promote(first)
+    assert predictor.get_model().version == first
+
+    (config.MODEL_REGISTRY_DIR / second / model_registry.BOOSTER_FILENAME).write_bytes(b"not a model")
+    assert predictor.load_model(second) is None
+    predictor.promote_model(second)
+    assert predictor.get_model().version == first
@@ -0,0 +1,176 @@
+# tests/test_streamer.py
+# Behavioural checks for the streaming scorer: its rolling features must
+# match the batch processor, including across gaps and a snapshot/restore.
+
+import itertools
+import json
+import socket
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src import config
+from src.monitoring import drift
+from src.prediction import streamer
+
+
+@pytest.fixture(autouse=True)
+def monitoring_paths(tmp_path, monkeypatch):
+    # Keep drift-monitoring output from the scorer out of the real data directory.
+    monkeypatch.setattr(config, 'REFERENCE_WINDOW_PATH', tmp_path / "monitoring" / "reference_window.json")
+    monkeypatch.setattr(config, 'MONITORING_PERIODS_DIR', tmp_path / "monitoring" / "daily")
+    monkeypatch.setattr(config, 'MONITORING_FLUSH_ROWS', 10 ** 9)
+    monkeypatch.setattr(config, 'MONITORING_FLUSH_SECONDS', 10 ** 9)
+    for name in ['_reference', '_reference_mtime', '_day', '_day_window']:
+        monkeypatch.setattr(drift, name, None)
+    monkeypatch.setattr(drift, '_unflushed_rows', 0)
+
+
+class RainfallModel:
+    """Stand-in model whose flood probability follows the 24h rainfall average."""
+    threshold = 0.5
+    version = "test"
+
+    def predict_proba(self, df):
+        probabilities = np.clip(df['rainfall_24hr_avg'].to_numpy() / 10, 0, 1)
+        return np.column_stack([1 - probabilities, probabilities])
+
+
+def _make_observations(hours=200):
+    rng = np.random.default_rng(0)
+    rows = []
+    for lat, lon in [(24.86, 67.01), (31.52, 74.35)]:
+        rainfall = rng.gamma(0.5, 4.0, size=hours)
+        rainfall[rng.random(hours) < 0.15] = np.nan  # Gaps in the feed
+        rainfall[100:130] = np.nan                   # A gap longer than the short window
+        for timestamp, value in zip(pd.date_range('2024-07-01', periods=hours, freq='h'), rainfall):
+            rows.append({'lat': lat, 'lon': lon, 'timestamp': timestamp.isoformat(),
+                         'rainfall_mm_per_hr': None if np.isnan(value) else float(value)})
+    return rows
+
+
+def _processor_features(observations):
+    # Mirrors the rolling-average step in `processor.process_and_feature_engineer`.
+    df = pd.DataFrame(observations)
+    df['rainfall_mm_per_hr'] = df['rainfall_mm_per_hr'].astype(float)
+    df.sort_values(by=['lat', 'lon', 'timestamp'], inplace=True)
+    grouped = df.groupby(['lat', 'lon'])['rainfall_mm_per_hr']
+    df['rainfall_24hr_avg'] = grouped.transform(
+        lambda x: x.rolling(window=config.RAINFALL_SHORT_WINDOW_HRS, min_periods=1).mean())
+    df['rainfall_72hr_avg'] = grouped.transform(
+        lambda x: x.rolling(window=config.RAINFALL_LONG_WINDOW_HRS, min_periods=1).mean())
+    df.fillna(0, inplace=True)
+    return df.set_index(['lat', 'lon', 'timestamp'])
+
+
+def _write_jsonl(path, rows):
+    with open(path, 'w') as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def test_streaming_features_match_processor_across_restore(tmp_path):
+    observations = _make_observations()
+    expected = _processor_features(observations)
+    state_path = tmp_path / "state.json"
+
+    # Interleave locations by time, as a live feed would deliver them.
+    observations.sort(key=lambda row: row['timestamp'])
+    half = len(observations) // 2
+    first_feed, second_feed = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+    _write_jsonl(first_feed, observations[:half])
+    _write_jsonl(second_feed, observations[half:])
+
+    results = []
+    scorer = streamer.StreamScorer(model=RainfallModel(), state_path=state_path, terrain={})
+    for observation in streamer.file_source(first_feed):
+        results.append(scorer.score(observation))
+    scorer.snapshot()
+
+    resumed = streamer.StreamScorer(model=RainfallModel(), state_path=state_path, terrain={})
+    assert resumed.restore()
+    # Replayed observations are skipped rather than double-counted.
+    assert resumed.score(observations[half - 1]) is None
+    for observation in streamer.file_source(second_feed):
+        results.append(resumed.score(observation))
+
+    assert len(results) == len(observations)
+    for result in results:
+        row = expected.loc[(result['lat'], result['lon'], result['timestamp'])]
+        for feature in ['rainfall_mm_per_hr', 'rainfall_24hr_avg', 'rainfall_72hr_avg']:
+            assert abs(result['features'][feature] - row[feature]) < 1e-9
+
+
+def test_socket_source_feeds_scorer_and_raises_alerts(tmp_path):
+    timestamps = pd.date_range('2024-08-01', periods=48, freq='h')
+    observations = [
+        {'lat': 25.39, 'lon': 68.35, 'timestamp': t.isoformat(),
+         'rainfall_mm_per_hr': 20.0 if 10 <= i < 16 else 0.0}
+        for i, t in enumerate(timestamps)
+    ]
+
+    server = socket.create_server(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+
+    def serve():
+        connection, _ = server.accept()
+        with connection:
+            for i, observation in enumerate(observations):
+                if i == 5:
+                    # Bad records mid-stream must be skipped, not end the stream.
+                    connection.sendall(b'{"lat": 25.39, "lon": \n')
+                    connection.sendall(b'{"lat": 25.39, "lon": 68.35, "rainfall_mm_per_hr": 1.0}\n')
+                connection.sendall((json.dumps(observation) + "\n").encode())
+        server.close()
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+
+    alerts = []
+    scorer = streamer.StreamScorer(model=RainfallModel(), state_path=tmp_path / "state.json",
+                                   terrain={}, on_alert=alerts.append)
+    scored = scorer.run(streamer.socket_source('127.0.0.1', port))
+    thread.join()
+
+    assert scored == len(observations)
+    assert [alert['alert'] for alert in alerts] == ["RAISED", "CLEARED"]
+    assert (tmp_path / "state.json").exists()
+
+
+def test_file_source_follow_waits_for_complete_lines(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text("")
+    first = json.dumps({'lat': 24.86, 'lon': 67.01, 'timestamp': '2024-07-01T00:00:00', 'rainfall_mm_per_hr': 1.5})
+    second = json.dumps({'lat': 24.86, 'lon': 67.01, 'timestamp': '2024-07-01T01:00:00', 'rainfall_mm_per_hr': 2.5})
+
+    def write():
+        with open(feed, 'a') as f:
+            f.write(first + "\n" + second[:20])
+            f.flush()
+            time.sleep(0.2)
+            f.write(second[20:] + "\n")
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    received = list(itertools.islice(streamer.file_source(feed, follow=True, poll_interval=0.01), 2))
+    thread.join()
+
+    assert [obs['rainfall_mm_per_hr'] for obs in received] == [1.5, 2.5]
+
+
+def test_snapshot_records_scored_rows_for_drift_monitoring(tmp_path):
+    edges = {col: [0.0, 1.0] for col in config.FEATURE_LIST}
+    drift.MonitoringWindow.with_edges(edges, model_version="test").save(config.REFERENCE_WINDOW_PATH)
+
+    observations = _make_observations(hours=30)
+    scorer = streamer.StreamScorer(model=RainfallModel(), state_path=tmp_path / "state.json",
+                                   snapshot_every=0, terrain={})
+    for observation in observations:
+        scorer.score(observation)
+    assert drift.load_latest_window("test") is None
+
+    scorer.snapshot()
+    latest = drift.load_latest_window("test")
+    assert latest.sketches['rainfall_24hr_avg'].stats.count == len(observations)
+    assert latest.sketches[config.PREDICTION_COLUMN].stats.count == len(observations)